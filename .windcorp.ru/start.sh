@@ -2,5 +2,6 @@
 # Starts the production server
 python3 manage.py makemigrations &&
 python3 manage.py migrate &&
+python3 manage.py update_latest_revisions &&
 python3 manage.py collectstatic &&
 gunicorn "$@"
@@ -1,18 +1,75 @@
 """An autogenerator of model declarations for api_lib.ts."""
 
+import bisect
 import datetime
+from functools import cache
 from inspect import cleandoc
 import os.path
+import re
 
 from django.conf import settings
 from django.db import models
 
-from javascript_pipeline import autogenerators
+import jinja2
 
 
-def _ts_template(string):
-    """Remove 2 levels of indentation from a multiline string literal."""
-    return '\n'.join(line[8:] for line in string.splitlines()[1:])
+# Path of this generator as reported in file headers
+_ME = os.path.relpath(__file__, settings.BASE_DIR)
+
+# Compiled template bytecode persists across runs in this directory. It is
+# only created when generating, so that importing this module writes nothing.
+_BYTECODE_CACHE_DIR = settings.BASE_DIR / '.jinja_cache'
+
+# Template sources by name; DictLoader gives the bytecode cache stable keys
+_SOURCES = {}
+
+_ENV = jinja2.Environment(
+    loader=jinja2.DictLoader(_SOURCES),
+    autoescape=False,
+    keep_trailing_newline=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_ENV.filters['repr'] = repr
+
+# Up to 2 levels of indentation at the start of each line
+_TEMPLATE_INDENT = re.compile(r'^ {0,8}', re.MULTILINE)
+
+# Header line that changes on every run; ignored when comparing outputs
+_GENERATED_AT_LINE = re.compile(r'^ \* Generated at: .*$', re.MULTILINE)
+
+
+def _enable_bytecode_cache():
+    """Let _ENV use the bytecode cache if its directory can be created."""
+    if _ENV.bytecode_cache is not None:
+        return
+    try:
+        _BYTECODE_CACHE_DIR.mkdir(exist_ok=True)
+    except OSError:
+        return  # e.g. read-only application directory; compile every time
+    _ENV.bytecode_cache = jinja2.FileSystemBytecodeCache(
+        str(_BYTECODE_CACHE_DIR))
+
+
+class _LazyTemplate:
+    """A template of _ENV that is only loaded when first rendered."""
+
+    def __init__(self, name):
+        self.name = name
+        self._template = None
+
+    def render(self, **ctxt):
+        if self._template is None:
+            self._template = _ENV.get_template(self.name)
+        return self._template.render(**ctxt)
+
+
+def _ts_template(name, string):
+    """Register a multiline string literal with 2 levels of indentation removed
+    as a template.
+    """
+    _SOURCES[name] = _TEMPLATE_INDENT.sub('', string.partition('\n')[2])
+    return _LazyTemplate(name)
 
 
 def _make_jsdoc(doc, indent_level=0):
@@ -23,31 +80,37 @@ def _make_jsdoc(doc, indent_level=0):
             + f"\n{indent} */")
 
 
+@cache
+def _model_jsdoc(model):
+    """Format the docstring of model class as a JavaScript comment."""
+    return _make_jsdoc(cleandoc(model.__doc__ or ''))
+
+
 class _TypeScriptTemplates:  # namespace
     """Namespace for TypeScript file fragments.
 
-    As fragments are used as Python format strings, literal { and } need to be
-    escaped as {{ and }}.
+    Fragments are Jinja2 templates, compiled when first rendered. Substitutions
+    are written as {{ name }}; literal { and } need no escaping.
     """
 
-    HEADER = _ts_template('''
+    HEADER = _ts_template('HEADER', '''
         /*
          * THIS IS AN AUTOGENERATED FILE
          * Do not commit this file to version control.
-         * Generator: {me}
-         * Generated at: {date}
+         * Generator: {{ me }}
+         * Generated at: {{ date }}
          *
          * Model class declarations for dataman
          */
 
-        import {{
+        import {
             ModelBase,
             ModelClass,
             ModelManager,
             manageModel,
             Status,
-        }} from './api_lib';
-        import {{ getInjection }} from 'util/common';
+        } from './api_lib';
+        import { getInjection } from 'util/common';
 
         /**
          * Create a ModelManager and store it in modelClass.objects.
@@ -60,78 +123,71 @@ class _TypeScriptTemplates:  # namespace
         function autogenManageModel<Model extends ModelBase>(
             modelClass: ModelClass<Model>,
             modelAPIName: string,
-        ): void {{
+        ): void {
             const template = getInjection<string>('dataman-endpoint');
             const path = template.replace('MODEL_NAME', modelAPIName);
             manageModel(modelClass, new URL(path, window.location.origin));
-        }}
+        }
     ''')
 
-    FOOTER = ''
+    FOOTER = _ts_template('FOOTER', '')
 
-    CLASS_START = _ts_template('''
-        {model_docs}
-        export class {model} extends ModelBase {{
+    MODEL = _ts_template('MODEL', '''
+
+        {{ model_docs }}
+        export class {{ model }} extends ModelBase {
             /*
              * This model's ModelManager.
              */
-            static objects: ModelManager<{model}>;
+            static objects: ModelManager<{{ model }}>;
 
             /**
              * Field groups available for this model.
              */
-            static fields = {model_groups};
-    ''')
-
-    FIELD = _ts_template('''
-
-            {field_name}: {field_type} | null = null;
-    ''')
-
-    RESOLVE_FIELD = _ts_template('''
-
-            {field_name}: number{field_array} | null = null;
-            {field_base_name}: {field_type}{field_array} | null = null;
-            static '_type_of_{field_base_name}': \
-ModelClass<{field_type}> | null = null;
-    ''')
-
-    FIELD_GROUP = _ts_template('''
-            private '_fields_{group_name}': Status = Status.NotRequested;
-    ''')
-
-    CLASS_END = _ts_template('''
-        }}
-        autogenManageModel({model}, {model_api_name!r});
+            static fields = {{ model_groups }};
+        {% for field in fields %}
+
+          {% if field.field_base_name is defined %}
+            {{ field.field_name }}: \
+number{{ field.field_array }} | null = null;
+            {{ field.field_base_name }}: \
+{{ field.field_type }}{{ field.field_array }} | null = null;
+            static '_type_of_{{ field.field_base_name }}': \
+ModelClass<{{ field.field_type }}> | null = null;
+          {% else %}
+            {{ field.field_name }}: {{ field.field_type }} | null = null;
+          {% endif %}
+        {% endfor %}
+
+        {% for group in groups %}
+            private '_fields_{{ group }}': Status = Status.NotRequested;
+        {% endfor %}
+        }
+        autogenManageModel({{ model }}, {{ model_api_name|repr }});
         /**
-         * Shortcut for {model}.objects.
+         * Shortcut for {{ model }}.objects.
          */
-        export const {model}s = {model}.objects;
+        export const {{ model }}s = {{ model }}.objects;
     ''')
 
-    RESOLVE_TYPES_INIT_START = _ts_template('''
+    RESOLVE_TYPES_INIT_START = _ts_template('RESOLVE_TYPES_INIT_START', '''
 
         /*
          * Initialize _type_of_X fields
          */
     ''')
 
-    RESOLVE_TYPES_INIT_ENTRY = _ts_template('''
-        {model}['_type_of_{field_base_name}'] = {field_type};
-    ''')
-
-    RESOLVE_TYPES_INIT_END = _ts_template('')
+    RESOLVE_TYPES_INIT_END = _ts_template('RESOLVE_TYPES_INIT_END', '')
 
 
 class _APIAutogenerator():
     """Autogenerator of models.autogenerated.ts."""
 
     def __init__(self):
-        # Models to include
+        # Models to include, sorted by name
         self.models = []
 
-        # List of context dicts for RESOLVE_TYPES_INIT_ENTRY, one for each
-        # resolve field.
+        # List of resolve field descriptions, one for each resolve field.
         self.resolve_init = None
 
     def include_model(self, model):
@@ -139,7 +195,7 @@ class _APIAutogenerator():
 
         Model must be a API model.
         """
-        self.models.append(model)
+        bisect.insort(self.models, model, key=lambda m: m.__name__)
 
     def __call__(self):
         """Generate models.autogenerated.ts using models included previously.
@@ -148,119 +204,122 @@ class _APIAutogenerator():
         path = (settings.BASE_DIR / 'api_lib' / 'webpack_src'
                 / 'models.autogenerated.ts')
 
-        with open(path, 'w') as f:
-            ctxt = {
-                'me': os.path.relpath(__file__, settings.BASE_DIR),
-                'date': datetime.datetime.now().isoformat()
-            }
+        # Render into memory first so that an unchanged file is not touched
+        parts = []
+        output = parts.append
 
-            # Transition to working state
-            self.resolve_init = []
+        ctxt = {
+            'me': _ME,
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
 
-            # Write file header
-            f.write(_TypeScriptTemplates.HEADER.format(**ctxt))
+        # Transition to working state
+        self.resolve_init = []
 
-            # Write models
-            for model in sorted(self.models, key=lambda m: m.__name__):
-                self.write_model(f.write, model, ctxt)
+        # Write file header
+        output(_TypeScriptTemplates.HEADER.render(**ctxt))
 
-            # Write resolve fields late initialization
-            self.write_resolve_init(f.write, ctxt);
+        # Write models
+        for model in self.models:
+            self.write_model(output, model, ctxt)
 
-            # Write file footer
-            f.write(_TypeScriptTemplates.FOOTER.format(**ctxt))
+        # Write resolve fields late initialization
+        self.write_resolve_init(output, ctxt);
 
-    def write_model(self, output, model, ctxt):
-        """Output the definition of a single model."""
-        templ = _TypeScriptTemplates
+        # Write file footer
+        output(_TypeScriptTemplates.FOOTER.render(**ctxt))
 
-        # Extend context
-        ctxt = {**ctxt,
-            'model': model.__name__,
-            'model_groups': (
-                '[' + ', '.join(
-                    repr(r) for r in model._api.field_groups.keys()
-                ) + ']'
-            ),
-            'model_api_name': model._api.api_name,
-            'model_docs': _make_jsdoc(cleandoc(model.__doc__)),
-        }
+        # Only rewrite the file when contents other than the timestamp differ
+        # to avoid needless recompilation by webpack
+        new_contents = ''.join(parts)
+        try:
+            old_contents = path.read_text()
+        except FileNotFoundError:
+            old_contents = None
 
-        # Output model header
-        output('\n')
-        output(templ.CLASS_START.format(**ctxt))
+        if (old_contents is None
+                or _GENERATED_AT_LINE.sub('', new_contents)
+                != _GENERATED_AT_LINE.sub('', old_contents)):
+            path.write_text(new_contents)
 
-        # Output all fields
-        for field_name in sorted(model._api.all_fields):
+    def write_model(self, output, model, ctxt):
+        """Output the definition of a single model."""
+
+        # Collect fields
+        fields = []
+        for field_name in model._api.all_fields:
             # Try dealing with resolve fields separately
-            if field_name.endswith('_id') or field_name.endswith('_ids'):
-                if self.write_resolve_field(output, model, field_name, ctxt):
+            if field_name.endswith(('_id', '_ids')):
+                data = self.resolve_field(model, field_name)
+                if data is not None:
+                    fields.append(data)
                     continue
 
             # Normal field
-            output(templ.FIELD.format(**{**ctxt,
-                'field_name': field_name,
-                'field_type': 'any',
-            }))
-
-        # Output field group trackers
-        output('\n')
-        for group in model._api.field_groups.keys():
-            output(templ.FIELD_GROUP.format(**{**ctxt,
-                'group_name': group
-            }))
-
-        # Output model footer
-        output(templ.CLASS_END.format(**ctxt))
-
-    def write_resolve_field(self, output, model, field_name, ctxt):
-        """Output a resolve field or return False."""
-
-        # Determine type of resolve field
-        if field_name.endswith('_id'):
-            suffix = '_id'
-            field_array = ''
-        elif field_name.endswith('_ids'):
-            suffix = '_ids'
-            field_array = '[]'
-        else:
-            assert False
-        base_name = field_name.removesuffix(suffix)
+            fields.append({'field_name': field_name, 'field_type': 'any'})
+
+        groups = tuple(model._api.field_groups)
+
+        # Output the model with all its fields and field group trackers in one
+        # go; the loops run inside the compiled template
+        output(_TypeScriptTemplates.MODEL.render(
+            model=model.__name__,
+            model_groups='[' + ', '.join(map(repr, groups)) + ']',
+            model_api_name=model._api.api_name,
+            model_docs=_model_jsdoc(model),
+            fields=fields,
+            groups=groups,
+        ))
+
+    def resolve_field(self, model, field_name):
+        """Describe a resolve field or return None.
+
+        The description is the context for MODEL fields. It is remembered for
+        write_resolve_init().
+        """
+
+        # Determine type of resolve field; field_name ends with _id or _ids
+        is_array = field_name.endswith('s')
+        suffix = '_ids' if is_array else '_id'
+        field_array = '[]' if is_array else ''
+        base_name = field_name[:-len(suffix)]
 
         # Obtain referenced model class
         field_type = model._meta.get_field(base_name).related_model
         assert field_type is not None
         if field_type not in self.models:
             # External references are opaque
-            return False
+            return None
 
-        # Context for RESOLVE_TYPES_INIT_ENTRY
         data = {
-            'model': ctxt['model'],
+            'model': model.__name__,
             'field_name': field_name,
             'field_base_name': base_name,
             'field_type': field_type.__name__,
             'field_array': field_array,
         }
 
-        output(_TypeScriptTemplates.RESOLVE_FIELD.format(**{**ctxt, **data}))
         self.resolve_init.append(data)
-        return True
+        return data
 
     def write_resolve_init(self, output, ctxt):
         """Output resolve field Initializers."""
         templ = _TypeScriptTemplates
 
-        output(templ.RESOLVE_TYPES_INIT_START.format(**ctxt))
+        output(templ.RESOLVE_TYPES_INIT_START.render(**ctxt))
         for data in self.resolve_init:
-            output(templ.RESOLVE_TYPES_INIT_ENTRY.format(**{**ctxt, **data}))
-        output(templ.RESOLVE_TYPES_INIT_END.format(**ctxt))
+            output(f"{data['model']}['_type_of_{data['field_base_name']}'] = "
+                   f"{data['field_type']};\n")
+        output(templ.RESOLVE_TYPES_INIT_END.render(**ctxt))
 
 
-# Create singleton and register it
 _INSTANCE = _APIAutogenerator()
 
-autogenerators.register(_INSTANCE)
+
+def generate():
+    """Generate models.autogenerated.ts with all included models."""
+    _enable_bytecode_cache()
+    _INSTANCE()
 
 
 def include_model(model):
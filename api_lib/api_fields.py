@@ -102,24 +102,48 @@ two fields: `my_field` in the default '*' group, and `fav_pizza` in groups
     >>> t34.color
     ''
 
+To create or update many objects at once, use api_deserialize_many(). Unlike
+api_deserialize(), it saves the objects:
+
+    >>> Car.api_deserialize_many([{'id': 123, 'make': 'Tumbler'}])
+    [<Car: Car object (123)>]
+
 ## Handling of relational fields
 
 Relational fields are serialized to relevant primary keys. This is currently
 implemented by using fields with `_id` suffix if they exist.
 
+Properties that read related objects should declare them with
+`_api.add_prefetch('relation', groups=...)` so that querysets are prefetched
+accordingly.
+
 Note that fields are set in the order of their registration.
 """
 
 import builtins
-from collections import namedtuple
+from collections import defaultdict, namedtuple
+from itertools import islice
+import keyword
 import re
+import sys
 
-from django.db import models
+from django.db import models, transaction
+from django.dispatch import Signal
 
 from taggit.managers import _TaggableManager
 
 from . import api_autogenerator
 from . import api_server
+from . import last_modified_manager
+
+
+# Sent by api_deserialize_many() with keyword arguments objects, the saved
+# objects, and previous, the prior states of updated objects. Sent inside the
+# transaction, since bulk saves send no post_save signals.
+bulk_deserialized = Signal()
+
+# Positions before capital letters except the first, e.g. in 'My|Model'
+_CAMEL_CASE_BOUNDARY = re.compile(r'(?<!^)(?=[A-Z])')
 
 
 def api_model(cls):
@@ -130,11 +154,13 @@ def api_model(cls):
     """
 
     cls._api._assemble_groups(cls)
-
     api_server.all_models[cls._api.api_name] = cls
 
+    # Shortcut to serializers for the hot path of api_serialize()
+    cls._api_serializers = cls._api._serializers
     cls.api_serialize = _api_serialize_impl
     cls.api_deserialize = _api_deserialize_impl
+    cls.api_deserialize_many = _api_deserialize_many_impl
 
     api_autogenerator.include_model(cls)
 
@@ -210,8 +236,8 @@ class APIEngine:
         def __init__(self, find_by, groups, getter=None, setter=None):
             if isinstance(groups, str):
                 raise TypeError('groups must be a non-str iterable')
-            bad_groups = [g for g in groups if not isinstance(g, str)]
-            if bad_groups:
+            if not all(isinstance(g, str) for g in groups):
+                bad_groups = [g for g in groups if not isinstance(g, str)]
                 raise TypeError(f"groups must be strs, not {bad_groups}")
 
             self.find_by = find_by
@@ -222,7 +248,13 @@ class APIEngine:
         self._requests = []
         self.field_groups = None
         self.api_name = None
-        pass
+        self.all_fields = None  # sorted names of all fields in all groups
+        self._serializers = {}
+        self._deserializers = {}
+        self._bulk_deserializers = {}
+        self._db_projections = {}
+        self._extra_prefetch = defaultdict(list)
+        self._values_plans = {}  # groups that values() can serialize
 
     def __call__(self, *groups):
         return _Registrar(self, groups or ['*'])
@@ -274,36 +306,54 @@ class APIEngine:
                        getter=_related_manager_get,
                        setter=_related_manager_set)
 
+    def add_prefetch(self, lookup, groups='*'):
+        """Prefetch lookup when serializing querysets in given groups.
+
+        Use this for custom getters that read related objects. Related managers
+        registered as fields only have primary keys of their objects loaded.
+
+        groups can be a single str or an iterable of strs. If omitted, defaults
+        to '*'.
+        """
+        if self._requests is None:
+            raise ValueError('API is already assembled, '
+                             f"cannot request prefetch of {lookup!r}")
+        if isinstance(groups, str):
+            groups = [groups]
+        for group in groups:
+            self._extra_prefetch[group].append(lookup)
+
     def _assemble_groups(self, cls):
-        field_groups = {}
+        field_groups = defaultdict(list)
         requests = self._requests
         self._requests = None
 
+        # Objects referenced by requests are looked up by identity; index the
+        # candidates once instead of scanning them for every request
+        annotation_names = _index_by_id(getattr(cls, '__annotations__', {}))
+        attribute_names = _index_by_id(cls.__dict__)
+
         for request in requests:
             if isinstance(request.find_by, str):
                 name = request.find_by
             elif isinstance(request.find_by, _Registrar):
-                if not hasattr(cls, '__annotations__'):
-                    continue
-                name = _find_exactly_one(
-                    (name for name, annotation in cls.__annotations__.items()
-                     if annotation is request.find_by),
-                    message_if_zero=None,
-                    message_if_many=('@_api() annotation reused on fields {{}}'
-                                     f" in {cls}")
-                )
-                if name is None:
+                names = annotation_names.get(id(request.find_by))
+                if names is None:
                     continue
+                if len(names) > 1:
+                    raise ValueError('@_api() annotation reused on fields '
+                                     f"{names} in {cls}")
+                name = names[0]
             else:
-                name = _find_exactly_one(
-                    (name for name, value in cls.__dict__.items()
-                     if value is request.find_by),
-                    message_if_zero=(f"Attribute object {request.find_by}, "
-                                     f"marked as API, not found in {cls}"),
-                    message_if_many=(f"Attribute object {request.find_by}, "
+                names = attribute_names.get(id(request.find_by))
+                if names is None:
+                    raise ValueError(f"Attribute object {request.find_by}, "
+                                     f"marked as API, not found in {cls}")
+                if len(names) > 1:
+                    raise ValueError(f"Attribute object {request.find_by}, "
                                      'marked as API, found in several fields '
-                                     f"in {cls}: {{}}")
-                )
+                                     f"in {cls}: {names}")
+                name = names[0]
 
             if request.accessors:
                 field = FieldMeta(name, *request.accessors)
@@ -311,17 +361,85 @@ class APIEngine:
                 field = _determine_field_meta(cls, name)
 
             for group in request.groups:
-                if group not in field_groups:
-                    field_groups[group] = []
                 field_groups[group].append(field)
 
-        self.field_groups = field_groups
-        self.api_name = re.sub(r'(?<!^)(?=[A-Z])', '_', cls.__name__).lower();
-        self.all_fields = { meta.name for group in self.field_groups.values()
-                                      for meta in group }
+        # Groups are frozen; FieldMetas are only read when compiling
+        self.field_groups = {group: tuple(fields)
+                             for group, fields in field_groups.items()}
+
+        # Compile (de-)serializers and plan queries once per group
+        for group, fields in self.field_groups.items():
+            self._serializers[group] = _generate_serializer(fields)
+            self._deserializers[group] = _generate_deserializer(fields)
+            self._bulk_deserializers[group] = \
+                _plan_bulk_deserialization(cls, fields)
+            projection = _plan_db_projection(
+                cls, fields, self._extra_prefetch.get(group, ()))
+            self._db_projections[group] = projection
+            if group not in self._extra_prefetch:
+                values_plan = _plan_values(cls, fields)
+                if values_plan is not None:
+                    self._values_plans[group] = values_plan
+
+        self.api_name = sys.intern(_CAMEL_CASE_BOUNDARY.sub('_', cls.__name__)
+                                   .lower())
+        self.all_fields = tuple(sorted({
+            meta.name for group in self.field_groups.values() for meta in group
+        }))
+
+    def prepare_queryset(self, queryset, group='*'):
+        """Adjust queryset for serialization of its instances in given group.
+
+        Only columns used by the group are loaded when all of its fields are
+        known to read columns directly. Related managers and tags are
+        prefetched; related objects are reduced to primary keys in the former
+        case. Lookups registered with add_prefetch() are prefetched in full.
+        """
+        only, prefetch, prefetch_pks = self._get_by_group(self._db_projections,
+                                                          group)
+        if only is not None:
+            queryset = queryset.only(*only)
+        if prefetch or prefetch_pks:
+            queryset = queryset.prefetch_related(
+                *prefetch,
+                *(_prefetch_pks(queryset.model, n) for n in prefetch_pks))
+        return queryset
+
+    def serialize_queryset(self, queryset, group='*', chunk_size=None):
+        """Serialize instances of queryset in given group.
+
+        Return an iterator of dicts equal to what api_serialize() returns. If
+        all fields of the group are plain columns, related managers or tags,
+        rows are read with values() without creating model instances; each
+        relation is then read with one values_list() query per chunk. If
+        chunk_size is given, the queryset is fetched with QuerySet.iterator()
+        in chunks of this size.
+        """
+        values_plan = self._values_plans.get(group)
+        if values_plan is not None:
+            return _serialize_values(queryset, *values_plan, chunk_size)
+
+        queryset = self.prepare_queryset(queryset, group)
+        serialize = self._get_serializer(group)
+
+        if chunk_size is not None:
+            queryset = queryset.iterator(chunk_size=chunk_size)
+        return map(serialize, queryset)
 
     def _get_fields(self, group):
-        result = self.field_groups.get(group, None)
+        return self._get_by_group(self.field_groups, group)
+
+    def _get_serializer(self, group):
+        return self._get_by_group(self._serializers, group)
+
+    def _get_deserializer(self, group):
+        return self._get_by_group(self._deserializers, group)
+
+    def _get_bulk_deserializer(self, group):
+        return self._get_by_group(self._bulk_deserializers, group)
+
+    def _get_by_group(self, mapping, group):
+        result = mapping.get(group, None)
         if result is not None:
             return result
         raise ValueError(f"No fields registered in group {group!r}")
@@ -333,31 +451,12 @@ class APIEngine:
         return 'APIEngine'
 
 
-def _find_exactly_one(candidates, message_if_zero, message_if_many):
-    """Extract the only item from candidates, or optionally raise errors."""
-
-    non_existant = object()
-    candidate_iterable = iter(candidates)
-
-    # Candidate 1 should exist
-    candidate1 = next(candidate_iterable, non_existant)
-    if candidate1 is non_existant:
-        if message_if_zero:
-            raise ValueError(message_if_zero)
-        else:
-            return None
-
-    # Candidate 2 should not exist
-    candidate2 = next(candidate_iterable, non_existant)
-    if candidate2 is not non_existant:
-        if message_if_many:
-            raise ValueError(message_if_many.format(
-                [candidate1, candidate2] + list(candidate_iterable)
-            ))
-        else:
-            return None
-
-    return candidate1
+def _index_by_id(mapping):
+    """Map ids of values in mapping to lists of their keys."""
+    index = {}
+    for key, value in mapping.items():
+        index.setdefault(id(value), []).append(key)
+    return index
 
 
 FieldMeta = namedtuple('FieldMeta',
@@ -365,22 +464,23 @@ FieldMeta = namedtuple('FieldMeta',
                        defaults=(getattr, setattr))
 
 
+# Marker for absent attributes
+_MISSING = object()
+
+
 def _determine_field_meta(cls, name):
     """Create FieldMeta for field registered as name in model cls."""
 
-    if not hasattr(cls, name):
+    attribute = getattr(cls, name, _MISSING)
+    if attribute is _MISSING:
         # Probably a dynamic attribute
         return FieldMeta(name)
 
-    attribute = getattr(cls, name)
-
-    # Check for foreign keys and use object IDs instead
-    if hasattr(attribute, 'field'):
-        django_field = attribute.field
-        if isinstance(django_field, models.ForeignKey):
-            return FieldMeta(django_field.attname)
-        elif isinstance(django_field, models.OneToOneField):
-            return FieldMeta(django_field.attname)
+    # Check for foreign keys and use object IDs instead; this includes
+    # OneToOneField, a subclass of ForeignKey
+    django_field = getattr(attribute, 'field', _MISSING)
+    if isinstance(django_field, models.ForeignKey):
+        return FieldMeta(django_field.attname)
 
     # Check for TaggableManager
     if isinstance(attribute, _TaggableManager):
@@ -395,9 +495,123 @@ def _determine_field_meta(cls, name):
     return FieldMeta(name)
 
 
+def _plan_db_projection(cls, fields, extra_prefetch=()):
+    """Determine how to query instances of cls to serialize given FieldMetas.
+
+    Return a tuple (only, prefetch, prefetch_pks) of field names. only is for
+    QuerySet.only(), or None if some field may need arbitrary columns. prefetch
+    lists relations to prefetch in full, including extra_prefetch, and
+    prefetch_pks lists relations whose objects only need primary keys.
+    """
+    columns = {f.attname: f.name for f in cls._meta.concrete_fields}
+    only = []
+    prefetch = list(extra_prefetch)
+    related = []
+
+    for name, getter, _ in fields:
+        if getter is _related_manager_get:
+            related.append(name.removesuffix('_ids'))
+        elif getter is _taggable_manager_get:
+            prefetch.append(name)
+        elif getter is getattr and name in columns:
+            if only is not None:
+                only.append(columns[name])
+        else:
+            # Custom getters may read any column; related objects they need
+            # are requested with APIEngine.add_prefetch()
+            only = None
+
+    return (tuple(only) if only is not None else None,
+            tuple(prefetch),
+            tuple(related))
+
+
+def _plan_values(cls, fields):
+    """Plan serialization of given FieldMetas of cls from values() rows.
+
+    Return a tuple (names, columns, relations), or None if some field has a
+    custom getter. names are all field names in order. columns are names of
+    fields for values(). relations are (name, lookup) pairs of fields whose
+    values are read with values_list('pk', lookup).
+    """
+    attnames = {f.attname for f in cls._meta.concrete_fields}
+    columns = []
+    relations = []
+
+    for name, getter, _ in fields:
+        if getter is _related_manager_get:
+            relations.append((name, name.removesuffix('_ids')))
+        elif getter is _taggable_manager_get:
+            relations.append((name, name + '__name'))
+        elif getter is getattr and name in attnames:
+            columns.append(name)
+        else:
+            return None
+
+    return tuple(f.name for f in fields), tuple(columns), tuple(relations)
+
+
+def _rename_pk(row):
+    """Turn a values() row into a serialized object."""
+    row['id'] = row.pop('pk')
+    return row
+
+
+def _serialize_values(queryset, names, columns, relations, chunk_size):
+    """Serialize queryset according to a plan made by _plan_values()."""
+    rows = queryset.values(*columns, 'pk')
+    if chunk_size is not None:
+        rows = rows.iterator(chunk_size=chunk_size)
+    if not relations:
+        return map(_rename_pk, rows)
+    return _serialize_values_with_relations(
+        queryset.model, rows, names, relations, chunk_size)
+
+
+def _serialize_values_with_relations(model, rows, names, relations,
+                                     chunk_size):
+    rows = iter(rows)
+    while batch := list(islice(rows, chunk_size)):
+        pks = [row['pk'] for row in batch]
+        for name, lookup in relations:
+            values = defaultdict(list)
+            for pk, value in (model._base_manager.filter(pk__in=pks)
+                              .values_list('pk', lookup)):
+                if value is not None:  # rows without related objects
+                    values[pk].append(value)
+            for row in batch:
+                row[name] = values.get(row['pk'], [])
+
+        # Keep the key order of api_serialize()
+        for row in batch:
+            serialized = {name: row[name] for name in names}
+            serialized['id'] = row['pk']
+            yield serialized
+
+
+def _prefetch_pks(model, name):
+    """Create a Prefetch for relation name of model that only loads pks."""
+    field = model._meta.get_field(name)
+    columns = ['pk']
+    if field.one_to_many:
+        # Django matches reverse foreign keys by the column of related objects
+        columns.append(field.field.name)
+    return models.Prefetch(
+        name, queryset=field.related_model.objects.only(*columns))
+
+
+def _prefetched(obj, name):
+    """Return objects of relation name prefetched for obj, or None."""
+    cache = getattr(obj, '_prefetched_objects_cache', None)
+    return cache.get(name) if cache else None
+
+
 def _related_manager_get(obj, name):
-    manager = getattr(obj, name.removesuffix('_ids'))
-    return [pk for (pk,) in manager.values_list('pk')]
+    name = name.removesuffix('_ids')
+    prefetched = _prefetched(obj, name)
+    if prefetched is not None:
+        return [o.pk for o in prefetched]
+    return list(getattr(obj, name).values_list('pk', flat=True))
 
 
 def _related_manager_set(obj, name, value):
@@ -407,6 +621,9 @@ def _related_manager_set(obj, name, value):
 
 
 def _taggable_manager_get(obj, name):
+    prefetched = _prefetched(obj, name)
+    if prefetched is not None:
+        return [tag.name for tag in prefetched]
     return list(getattr(obj, name).names())
 
 
@@ -414,17 +631,98 @@ def _taggable_manager_set(obj, name, value):
     return getattr(obj, name).set(value)
 
 
+def _is_plain_attribute(name):
+    """Check whether obj.<name> is valid Python for attribute name."""
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def _generate_serializer(fields):
+    """Generate a function that serializes an object using given FieldMetas.
+
+    The function body is generated as Python source with one entry per field
+    so that fields with default getters are read with plain attribute access.
+    """
+    namespace = {}
+    entries = []
+    for index, (name, getter, _) in enumerate(fields):
+        if getter is getattr and _is_plain_attribute(name):
+            entries.append(f"{name!r}: obj.{name},")
+        else:
+            namespace[f"getter_{index}"] = getter
+            entries.append(f"{name!r}: getter_{index}(obj, {name!r}),")
+
+    source = '\n'.join([
+        'def serialize(obj):',
+        '    return {',
+        *(f"        {entry}" for entry in entries),
+        "        'id': obj.pk,",
+        '    }',
+    ])
+    exec(source, namespace)
+    return namespace['serialize']
+
+
+def _generate_deserializer(fields):
+    """Generate a function that deserializes an object using given FieldMetas.
+
+    See _generate_serializer().
+    """
+    namespace = {}
+    lines = [
+        'def deserialize(cls, data):',
+        '    obj = cls()',
+        "    if 'id' in data:",
+        "        obj.pk = data['id']",
+    ]
+    for index, (name, _, setter) in enumerate(fields):
+        lines.append(f"    if {name!r} in data:")
+        if setter is setattr and _is_plain_attribute(name):
+            lines.append(f"        obj.{name} = data[{name!r}]")
+        else:
+            namespace[f"setter_{index}"] = setter
+            lines.append(
+                f"        setter_{index}(obj, {name!r}, data[{name!r}])")
+    lines.append('    return obj')
+
+    exec('\n'.join(lines), namespace)
+    return namespace['deserialize']
+
+
+def _plan_bulk_deserialization(cls, fields):
+    """Prepare bulk deserialization of instances of cls using given FieldMetas.
+
+    Return a tuple (deserialize, columns, stored, late_fields). deserialize is
+    a deserializer of fields with default setters. columns are attnames that
+    deserialize may set. stored are the concrete fields of cls other than the
+    primary key. late_fields are (name, setter) pairs of fields with custom
+    setters, which need saved objects.
+    """
+    stored = tuple(f for f in cls._meta.concrete_fields if not f.primary_key)
+    attnames = {f.attname for f in stored}
+    early_fields = []
+    late_fields = []
+
+    for field in fields:
+        if field.setter is setattr:
+            early_fields.append(field)
+        else:
+            late_fields.append((field.name, field.setter))
+
+    return (_generate_deserializer(early_fields),
+            frozenset(f.name for f in early_fields if f.name in attnames),
+            stored,
+            tuple(late_fields))
+
+
 def _api_serialize_impl(self, group='*'):
     """Serializes this object into a Python dict.
 
     The dict will include the values of all API fields in the requested group,
     and `'id': self.pk`.
     """
-
-    fields = type(self)._api._get_fields(group)
-    result = {name: getter(self, name) for name, getter, _ in fields}
-    result['id'] = self.pk
-    return result
+    serialize = (self._api_serializers.get(group)
+                 or self._api._get_serializer(group))  # raises if unknown
+    return serialize(self)
 
 
 @classmethod
@@ -444,13 +742,73 @@ def _api_deserialize_impl(cls, data, group='*'):
 
     Returned object is not saved automatically.
     """
-    fields = cls._api._get_fields(group)
+    return cls._api._get_deserializer(group)(cls, data)
 
-    obj = cls()
-    if 'id' in data:
-        obj.pk = data['id']
 
-    for field, _, setter in fields:
-        if field in data:
-            setter(self, field, data[field])
-    return obj
+@classmethod
+def _api_deserialize_many_impl(cls, items, group='*'):
+    """Create or update objects from Python dicts in bulk and save them.
+
+    Each dict is deserialized like api_deserialize() does. Objects whose 'id'
+    already exists keep the stored values of fields missing from their dicts
+    and are saved with a single bulk_update(); the rest are saved with a single
+    bulk_create(). Fields with custom setters, such as related managers, are
+    set afterwards, one object at a time.
+
+    As with bulk_create() and bulk_update(), save() is not called and no
+    model signals are sent; bulk_deserialized is sent instead. Field.pre_save()
+    is called, so auto_now and similar fields are updated.
+
+    Returns the list of saved objects.
+    """
+    deserialize, columns, stored, late_fields = \
+        cls._api._get_bulk_deserializer(group)
+
+    objects = [deserialize(cls, data) for data in items]
+    if not objects:
+        return objects
+
+    with transaction.atomic():
+        existing = cls.objects.in_bulk(
+            [obj.pk for obj in objects if obj.pk is not None])
+
+        to_create = []
+        to_update = []
+        for obj, data in zip(objects, items):
+            old = existing.get(obj.pk)
+            if old is None:
+                to_create.append(obj)
+                continue
+
+            for field in stored:
+                if field.attname not in columns or field.attname not in data:
+                    setattr(obj, field.attname, getattr(old, field.attname))
+            obj._state.adding = False
+            obj._state.db = old._state.db
+
+            # bulk_update() does not call pre_save(), unlike save()
+            for field in stored:
+                setattr(obj, field.attname, field.pre_save(obj, add=False))
+            to_update.append(obj)
+
+        if to_update:
+            cls.objects.bulk_update(to_update, [f.name for f in stored])
+
+        if to_create:
+            cls.objects.bulk_create(to_create)
+
+        if late_fields:
+            if any(obj.pk is None for obj in to_create):
+                raise ValueError("Database did not return primary keys of "
+                                 "created objects; provide 'id' to set "
+                                 f"{[name for name, _ in late_fields]}")
+            for obj, data in zip(objects, items):
+                for name, setter in late_fields:
+                    if name in data:
+                        setter(obj, name, data[name])
+
+        bulk_deserialized.send(sender=cls, objects=objects,
+                               previous=list(existing.values()))
+
+    last_modified_manager.invalidate_cache()
+    return objects
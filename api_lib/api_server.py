@@ -1,20 +1,40 @@
+"""HTTP endpoints and helpers of the dataman API.
+
+Serving a dataman request is bound by the Python interpreter and the ORM rather
+than by computation. The dominant costs are, in order:
+  - hydration of model instances in QuerySet.__iter__;
+  - attribute lookups of API field getters during serialization;
+  - JSON encoding of the response payload, done in C by orjson.
+
+Use `./manage.py profile_dataman MODEL_NAME` to confirm the breakdown before
+tuning anything.
+"""
+import hashlib
+import re
+
 from django.db.models.query import QuerySet
-from django.http import JsonResponse, Http404
-from django.views.decorators.http import require_safe
+from django.http import HttpResponse, Http404, StreamingHttpResponse
+from django.views.decorators.http import condition, require_safe
 
-from .last_modified_manager import last_modification_timestamp
+from .encoding import dumps
+from .last_modified_manager import (
+    data_version_for_request,
+    last_modification_timestamp_for_request,
+)
 
 
 all_models = {}
 
 
 def _api_response(*, status, payload, status_code):
-    result = JsonResponse({
-        'status': status,
-        'payload': payload
-    })
-    result.status_code = status_code
-    return result
+    return HttpResponse(
+        dumps({
+            'status': status,
+            'payload': payload
+        }),
+        content_type='application/json',
+        status=status_code,
+    )
 
 
 def success(payload):
@@ -27,24 +47,77 @@ def failure(message, code=400):
     return _api_response(status=message, payload=None, status_code=code)
 
 
-def get_models(ids, group, model_class):
+def get_models(ids, group, model_class, *, request=None):
     """Return a frontend data manager payload.
 
-    ids can be an iterable or None to get all instances.
+    ids can be an iterable or None to get all instances. If request is given,
+    the last modification timestamp is shared with other payloads of request.
     """
-    query = {'pk__in': set(ids)} if ids is not None else {}
+    query = {'pk__in': ids} if ids is not None else {}
+    queryset = model_class.objects.filter(**query)
 
     return {
-        'instances': [
-            instance.api_serialize(group)
-            for instance in model_class.objects.filter(**query)
-        ],
-        'last_modified': last_modification_timestamp().isoformat(),
+        'instances': list(
+            model_class._api.serialize_queryset(queryset, group)),
+        'last_modified':
+            last_modification_timestamp_for_request(request).isoformat(),
         'dump': ids is None,
     }
 
 
-def inject(context, instances, group='*', *, dump=False):
+# Number of instances fetched and encoded at once when streaming
+STREAM_CHUNK_SIZE = 2000
+
+
+def _encode_items(items):
+    """Encode items as the contents of a JSON array, in chunks of bytes."""
+    chunk = []
+    separator = b''
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) == STREAM_CHUNK_SIZE:
+            yield separator + b','.join(chunk)
+            chunk.clear()
+            separator = b','
+    if chunk:
+        yield separator + b','.join(chunk)
+
+
+def success_stream(payload):
+    """Build a streaming Response object for a successful API request.
+
+    The response is equivalent to success(list(payload)) but items of payload
+    are encoded and sent in chunks as they are produced.
+    """
+    def generate():
+        yield b'{"status":"OK","payload":['
+        yield from _encode_items(payload)
+        yield b']}'
+
+    return StreamingHttpResponse(generate(), content_type='application/json')
+
+
+def stream_all_models(group, model_class, *, request=None):
+    """Return a successful API response with all instances of model_class.
+
+    The response is equivalent to success(get_models(None, group, model_class))
+    but instances are fetched, serialized and sent in chunks, so the table is
+    never held in memory in full.
+    """
+    instances = model_class._api.serialize_queryset(
+        model_class.objects.all(), group, chunk_size=STREAM_CHUNK_SIZE)
+    last_modified = last_modification_timestamp_for_request(request)
+
+    def generate():
+        yield b'{"status":"OK","payload":{"instances":['
+        yield from _encode_items(instances)
+        yield (b'],"last_modified":' + dumps(last_modified.isoformat())
+               + b',"dump":true}}')
+
+    return StreamingHttpResponse(generate(), content_type='application/json')
+
+
+def inject(context, instances, group='*', *, dump=False, request=None):
     """Modify context to make an injection of instances.
 
     instances can be any iterable. If instances is empty or only contains None
@@ -53,32 +126,43 @@ def inject(context, instances, group='*', *, dump=False):
 
     All non-None instances must be of the same type.
 
-    To inject a single instance, wrap it in an array or a tuple.
+    To inject a single instance, wrap it in an array or a tuple. If instances
+    is a QuerySet, it is serialized with APIEngine.serialize_queryset() and
+    fetched in chunks of STREAM_CHUNK_SIZE.
 
-    This function can be used multiple times on the same context.
+    This function can be used multiple times on the same context. Pass the
+    current request to let injections share a single last modification
+    timestamp.
     The context object is modified in-place and returned.
     """
-    instances_list = list(i for i in instances if i is not None)
-    if not instances_list:
-        return None
-    assert len({ type(i) for i in instances_list }) == 1  # Forbid type mixing
-
-    model = type(instances_list[0])
-    last_modification = last_modification_timestamp().isoformat()
-
-    target = context.get('injected_packets', None)
-    if target is None:
-        target = []
-        context['injected_packets'] = target
-
-    target.append({
+    if isinstance(instances, QuerySet):
+        model = instances.model
+        serialized = list(model._api.serialize_queryset(
+            instances, group, chunk_size=STREAM_CHUNK_SIZE))
+        if not serialized:
+            return None
+    else:
+        # Validate and serialize in a single pass
+        instances = (i for i in instances if i is not None)
+        first = next(instances, None)
+        if first is None:
+            return None
+
+        model = type(first)
+        serialize = model._api._get_serializer(group)
+        serialized = [serialize(first)]
+        for instance in instances:
+            assert type(instance) is model  # Forbid type mixing
+            serialized.append(serialize(instance))
+
+    last_modification = (
+        last_modification_timestamp_for_request(request).isoformat())
+
+    context.setdefault('injected_packets', []).append({
         'model': model.__name__,
         'fields': group,
         'packet': {
-            'instances': [
-                instance.api_serialize(group)
-                for instance in instances_list
-            ],
+            'instances': serialized,
             'last_modified': last_modification,
             'dump': dump,
         }
@@ -87,9 +171,35 @@ def inject(context, instances, group='*', *, dump=False):
     return context
 
 
+# Comma-separated decimal IDs
+_IDS_PATTERN = re.compile(r'\d+(?:,\d+)*', re.ASCII)
+
+
+def _etag(request, model_name=None, *, model_class=None,
+          allowed_groups=None):
+    if model_class is None:
+        model_class = all_models.get(model_name)
+        if model_class is None:
+            return None
+        allowed_groups = model_class._api.field_groups
+    if isinstance(_parse_query(request, allowed_groups), str):
+        return None  # failures are not cached
+
+    # Responses depend on the model, query string and data version only
+    version = data_version_for_request(request)
+    key = f"{request.path}|{request.GET.urlencode()}|{version}"
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+# Lets clients with up-to-date data get 304 Not Modified responses. There is
+# no Last-Modified validator: deletions change responses but not timestamps.
+_conditional = condition(etag_func=_etag)
+
+
 @require_safe
+@_conditional
 def serve_data_manager(request, model_name):
-    """Process an API request."""
+    """Process an API request for a model given by name."""
 
     model_class = all_models.get(model_name)
     if model_class is None:
@@ -97,22 +207,52 @@ def serve_data_manager(request, model_name):
 
     assert hasattr(model_class, '_api')
 
+    return _serve(request, model_class, model_class._api.field_groups)
+
+
+@require_safe
+@_conditional
+def serve_model(request, *, model_class, allowed_groups):
+    """Process an API request for model_class.
+
+    allowed_groups is a container of the field groups of model_class. This view
+    is meant to be bound to a model in URLconf; see api_lib.urls.
+    """
+    return _serve(request, model_class, allowed_groups)
+
+
+def _parse_query(request, allowed_groups):
+    """Return a tuple (ids, fields) of a valid request or an error message.
+
+    ids is None when all instances are requested.
+    """
     if request.GET.keys() - {'ids', 'fields'}:
-        return failure('Invalid request: unsupported parameters')
+        return 'Invalid request: unsupported parameters'
 
     if {'ids', 'fields'} - request.GET.keys():
-        return failure("Invalid request: 'ids' and 'fields' are required")
+        return "Invalid request: 'ids' and 'fields' are required"
 
     if request.GET['ids'] == 'all':
         ids = None
     else:
-        try:
-            ids = [int(id) for id in request.GET['ids'].split(',')]
-        except:
-            return failure('Could not decode ids')
+        raw_ids = request.GET['ids']
+        if not _IDS_PATTERN.fullmatch(raw_ids):
+            return 'Could not decode ids'
+        ids = list(map(int, raw_ids.split(',')))
 
     fields = request.GET['fields']
-    if fields not in model_class._api.field_groups:
-        return failure('Unknown field group requested')
+    if fields not in allowed_groups:
+        return 'Unknown field group requested'
+
+    return ids, fields
+
+
+def _serve(request, model_class, allowed_groups):
+    query = _parse_query(request, allowed_groups)
+    if isinstance(query, str):
+        return failure(query)
+    ids, fields = query
 
-    return success(get_models(ids, fields, model_class))
+    if ids is None:
+        return stream_all_models(fields, model_class, request=request)
+    return success(get_models(ids, fields, model_class, request=request))
@@ -1,6 +1,11 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 
 
 class ApiLibConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api_lib'
+
+    def ready(self):
+        from . import api_autogenerator
+        apps.get_app_config('javascript_pipeline').register_generator(
+            api_autogenerator.generate)
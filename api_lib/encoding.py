@@ -0,0 +1,31 @@
+"""JSON encoding with orjson, compatible with DjangoJSONEncoder."""
+from django.core.serializers.json import DjangoJSONEncoder
+
+import orjson
+
+
+# Types unknown to orjson and datetimes are encoded like DjangoJSONEncoder does
+_encode_default = DjangoJSONEncoder().default
+
+
+def dumps(obj):
+    """Encode obj as JSON bytes."""
+    return orjson.dumps(obj, default=_encode_default,
+                        option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class OrjsonEncoder(DjangoJSONEncoder):
+    """JSONEncoder that delegates to orjson.
+
+    For use where a JSONEncoder class is expected, e.g. the encoder argument of
+    JSONField. Output is compact UTF-8 without escaping of non-ASCII
+    characters; encoder options passed to json.dumps() are ignored.
+    """
+
+    def encode(self, o):
+        return orjson.dumps(
+            o,
+            default=self.default,
+            option=(orjson.OPT_PASSTHROUGH_DATETIME
+                    | orjson.OPT_NON_STR_KEYS),
+        ).decode()
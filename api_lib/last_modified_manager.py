@@ -1,17 +1,42 @@
 """Tracker and manager for last modification timestamp for API models."""
-from django.db.models import Max
+import datetime
+import time
 
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+
+
+# Seconds for which a computed timestamp is trusted. Changes made by this
+# process invalidate the cache immediately; other processes are only noticed
+# once it expires.
+CACHE_TTL = 5
+
+# Reported when no tracked objects exist
+_EPOCH = datetime.datetime.fromtimestamp(0, datetime.timezone.utc)
 
 _all_models = None
 
+# Incremented whenever a tracked object is saved or deleted
+_version = 0
 
-def last_modification_timestamp():
-    """Get last modification timestamp as UTC datetime.
+# Tuple (version, monotonic time of computation, timestamp, row count) or None
+_cached = None
 
-    Tracked objects include all API models.
+
+def invalidate_cache(**kwargs):
+    """Forget the cached timestamp.
+
+    Saving or deleting tracked objects does this automatically; call this after
+    modifications that send no signals, e.g. bulk operations.
+    """
+    global _version
+    _version += 1
+
+
+def _compute():
+    """Query the database for the last modification timestamp and row count.
     """
 
-    # TODO improve perfomance - this function should not run any heavy queries
     global _all_models
 
     # Steal all_models from api_server >:D (Terrible Temporary Solution)
@@ -21,8 +46,73 @@ def last_modification_timestamp():
         _all_models = [m for m in api_server.all_models.values()
                        if any(f.name == 'last_modified'
                               for f in m._meta.get_fields())]
+        for model in _all_models:
+            post_save.connect(invalidate_cache, sender=model)
+            post_delete.connect(invalidate_cache, sender=model)
 
-    return max(
-        model.objects.aggregate(Max('last_modified'))['last_modified__max']
+    aggregates = [
+        model.objects.aggregate(Max('last_modified'), Count('pk'))
         for model in _all_models
-    )
+    ]
+    timestamp = max((a['last_modified__max'] for a in aggregates
+                     if a['last_modified__max'] is not None),
+                    default=_EPOCH)
+    return timestamp, sum(a['pk__count'] for a in aggregates)
+
+
+def _get():
+    """Return a cached tuple (timestamp, row count), computing it if needed."""
+
+    global _cached
+
+    now = time.monotonic()
+    if _cached is not None:
+        version, computed_at, timestamp, count = _cached
+        if version == _version and now - computed_at < CACHE_TTL:
+            return timestamp, count
+
+    version = _version
+    timestamp, count = _compute()
+    _cached = (version, now, timestamp, count)
+    return timestamp, count
+
+
+def _get_for_request(request):
+    """Like _get(), but consistent within a single request if it is not None.
+    """
+    if request is None:
+        return _get()
+
+    result = getattr(request, '_api_last_modified', None)
+    if result is None:
+        result = _get()
+        request._api_last_modified = result
+    return result
+
+
+def last_modification_timestamp():
+    """Get last modification timestamp as UTC datetime.
+
+    Tracked objects include all API models. The value is cached for up to
+    CACHE_TTL seconds, or until a tracked object is saved or deleted.
+    """
+    return _get()[0]
+
+
+def last_modification_timestamp_for_request(request):
+    """Get last modification timestamp, consistent within a single request.
+
+    If request is None, this is equivalent to last_modification_timestamp().
+    """
+    return _get_for_request(request)[0]
+
+
+def data_version_for_request(request):
+    """Get a str that changes whenever tracked objects change.
+
+    Unlike the last modification timestamp, it also changes when objects are
+    deleted. It is consistent within a single request, cached like
+    last_modification_timestamp(), and can be used in ETags.
+    """
+    timestamp, count = _get_for_request(request)
+    return f"{timestamp.isoformat()}|{count}"
@@ -0,0 +1,61 @@
+"""Management command that profiles the dataman endpoint."""
+
+import cProfile
+import io
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from api_lib import api_server
+
+
+class Command(BaseCommand):
+    help = 'Profile serve_data_manager for a model with cProfile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model_name',
+                            help='API name of the model, e.g. submission')
+        parser.add_argument('--fields', default='*',
+                            help="field group to request (default: '*')")
+        parser.add_argument('--ids', default='all',
+                            help="comma-separated IDs or 'all' (default)")
+        parser.add_argument('--repeat', type=int, default=1,
+                            help='number of requests to profile (default: 1)')
+        parser.add_argument('--sort', default='cumulative',
+                            help="pstats sort key (default: 'cumulative')")
+        parser.add_argument('--limit', type=int, default=30,
+                            help='number of functions to list (default: 30)')
+
+    def handle(self, *args, model_name, fields, ids, repeat, sort, limit,
+               **options):
+        if model_name not in api_server.all_models:
+            raise CommandError(f"Unknown model {model_name!r}")
+
+        request = RequestFactory().get(f"/api/v0/get/{model_name}",
+                                       {'ids': ids, 'fields': fields})
+
+        def serve():
+            response = api_server.serve_data_manager(request, model_name)
+            # Streaming responses do their work while being consumed
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                content = response.content
+            if response.status_code != 200:
+                raise CommandError(f"Request failed: {content!r}")
+            return content
+
+        profiler = cProfile.Profile()
+        for _ in range(repeat):
+            content = profiler.runcall(serve)
+
+        self.stdout.write(f"{repeat} request(s), last response "
+                          f"{len(content)} bytes")
+
+        # OutputWrapper terminates every write() with a newline, which breaks
+        # pstats formatting
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.sort_stats(sort).print_stats(limit)
+        self.stdout.write(buffer.getvalue())
@@ -0,0 +1,15 @@
+from django import template
+from django.utils.html import json_script
+
+from api_lib.encoding import OrjsonEncoder
+
+register = template.Library()
+
+
+@register.filter
+def api_json_script(value, element_id=None):
+    """Like json_script, but encode value with orjson.
+
+    Use for large payloads such as injected packets.
+    """
+    return json_script(value, element_id, encoder=OrjsonEncoder)
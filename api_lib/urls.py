@@ -2,7 +2,15 @@ from django.urls import path
 
 from . import api_server
 
+# URLconf is loaded once all models, and therefore all API models, are known.
+# Each model is bound to its own route to skip model lookup on every request.
 urlpatterns = [
+    *(path(model_name, api_server.serve_model, {
+        'model_class': model_class,
+        'allowed_groups': frozenset(model_class._api.field_groups),
+    }) for model_name, model_class in api_server.all_models.items()),
+
+    # Fallback for unknown models; also used to reverse the endpoint URL
     path('<str:model_name>', api_server.serve_data_manager,
          name='dataman-endpoint')
 ]
@@ -1,52 +1,105 @@
-import atexit
+import hashlib
 import os
 import logging
+import shutil
+import signal
 import subprocess
 import sys
+import threading
+import weakref
 
 from django.apps import AppConfig
 from django.conf import settings
-
-from . import autogenerators
-
-# Autogenerators not imported elsewhere
-from . import logo_autogenerator
-from . import license_exposer
+from django.utils.autoreload import DJANGO_AUTORELOAD_ENV
 
 
 logger = logging.getLogger(__name__)
 
 
+# Resolved once rather than searched in PATH by every spawned child
 _NPM_EXECUTABLE = os.environ.get('NPM_EXECUTABLE', 'npm')
+_NPM_EXECUTABLE = shutil.which(_NPM_EXECUTABLE) or _NPM_EXECUTABLE
 BUILD_PRODUCTION = [_NPM_EXECUTABLE, 'run', 'build']
 BUILD_DEVELOPMENT = [_NPM_EXECUTABLE, 'run', 'dev']
 
+# Files in BASE_DIR that affect production builds, in addition to webpack_src
+# directories of all apps
+_BUILD_CONFIGS = [
+    '.browserslistrc',
+    'babel.config.json',
+    'package.json',
+    'package-lock.json',
+    'tsconfig.json',
+    'webpack.config.js',
+]
+
+
+# Set once ready() has run in this process
+_READY_DONE = False
+
 
 class JavascriptPipelineConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'javascript_pipeline'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Registered autogenerators; None once registration is closed
+        self.generators = []
+
+    def register_generator(self, generator):
+        """Register a callable generator of resources.
+
+        Autogenerators are executed sequentially in the order of registration
+        when this app becomes ready, but before webpack builds in production
+        mode. Autogenerators are skipped when webpack does not run.
+
+        Other apps register their autogenerators from their own ready(), so
+        they must precede this app in INSTALLED_APPS.
+        """
+        if self.generators is None:
+            raise ValueError(
+                'Autogenerator registration is no longer possible')
+        self.generators.append(generator)
+
     def ready(self):
         """Run frontend pipeline, including autogenerators, if necessary.
 
+        This method only does its work once per process. Under the runserver
+        autoreloader, it is also called in the watcher process and in every
+        server process the watcher (re)starts:
+          - the development daemon is started by the watcher and survives
+            reloads;
+          - autogenerators, and production builds if requested, run in server
+            processes, which see the current code.
+        Without the autoreloader (gunicorn, runserver --noreload, collect-
+        static), the process does all of the above. Gunicorn runs this in every
+        worker unless the application is preloaded with --preload.
+
         Environment variables:
 
         JAVASCRIPT_PIPELINE__SHOULD_RUN
           Set by wsgi.py and asgi.py. Set manually to encourage building front-
-          end. Overridden by either of PREVENT_RUNS and IS_RELOAD.
+          end. Overridden by PREVENT_RUNS.
 
         JAVASCRIPT_PIPELINE__PREVENT_RUNS
           Set manually to prevent frontend builds. Overrides SHOULD_RUN.
 
-        JAVASCRIPT_PIPELINE__IS_RELOAD
-          Set by this method to prevent duplicate runs due to live reloads.
-          Do not set manually. Overrides SHOULD_RUN.
-
         JAVASCRIPT_PIPELINE__TEST_PRODUCTION
           Set manually to force production mode behavior even with DEBUG.
           Useful for testing only; do not use in production.
         """
 
+        global _READY_DONE
+        if _READY_DONE:
+            return
+        _READY_DONE = True
+
+        from . import license_exposer, logo_autogenerator
+        self.register_generator(logo_autogenerator.generate)
+        self.register_generator(license_exposer.generate)
+
         try:
             def check(x):
                 return os.environ.get(f"JAVASCRIPT_PIPELINE__{x}", '')
@@ -62,27 +115,70 @@ class JavascriptPipelineConfig(AppConfig):
                 # Not a real server start
                 return
 
-            is_first_load = not check('IS_RELOAD')
+            uses_reloader = ('runserver' in sys.argv
+                             and '--noreload' not in sys.argv)
+            is_server = os.environ.get(DJANGO_AUTORELOAD_ENV) == 'true'
+            is_watcher = uses_reloader and not is_server
+            is_development = settings.DEBUG and not check('TEST_PRODUCTION')
 
-            # Run autogenerators
-            autogenerators.run()
+            if not is_watcher:
+                # Run autogenerators
+                run_autogenerators(self.generators,
+                                   skip_if_done=not is_development)
 
-            # Run script
-            if is_first_load:
-                if settings.DEBUG and not check('TEST_PRODUCTION'):
-                    start_development_daemon()
-                else:
+                if not is_development:
                     build_pipeline()
 
-            # Prevent re-runs
-            os.environ['JAVASCRIPT_PIPELINE__IS_RELOAD'] = 'true'
+            if is_development and not is_server:
+                self.webpack_process = start_development_daemon()
+                _terminate_on_exit(self, self.webpack_process)
 
         finally:
-            autogenerators.cancel_registrations()
+            self.generators = None
+
+
+def run_autogenerators(generators, skip_if_done=False):
+    """Run generators in order and record their completion.
+
+    If skip_if_done is set, autogenerators are skipped when they have already
+    completed for the current source logo and deployed revision. Several
+    management commands run back to back in a deployment only generate files
+    once this way.
+    """
+    marker = _autogen_marker()
+    marker_file = (settings.BASE_DIR / 'autogenerated_static'
+                   / '.autogen_done')
+
+    if skip_if_done and marker is not None:
+        try:
+            if marker_file.read_text() == marker:
+                logger.info('Autogenerated files are up to date')
+                return
+        except FileNotFoundError:
+            pass
+
+    for generator in generators:
+        generator()
+
+    if marker is not None:
+        marker_file.write_text(marker)
+
+
+def _autogen_marker():
+    """Describe inputs of autogenerators, or return None if unknown.
+
+    Generated files also depend on code, so the marker is only known when the
+    deployed revision is given in GIT_SHA.
+    """
+    git_sha = os.getenv('GIT_SHA')
+    if not git_sha:
+        return None
+    source = settings.BASE_DIR / 'static' / 'logo.svg'
+    return f"{git_sha}\0{source.stat().st_mtime}"
 
 
 def start_development_daemon():
-    """Start a live update daemon and add a shutdown hook to kill it.
+    """Start a live update daemon and return its Popen.
 
     This function does not wait for the initial build to complete.
     """
@@ -93,8 +189,34 @@ def start_development_daemon():
             "initial build before 'collectstatic' terminates, and some static "
             'files will be missing.')
 
-    process = subprocess.Popen(BUILD_DEVELOPMENT, cwd=settings.BASE_DIR)
-    atexit.register(subprocess.Popen.terminate, process)
+    return subprocess.Popen(BUILD_DEVELOPMENT, cwd=settings.BASE_DIR,
+                            stdin=subprocess.DEVNULL)
+
+
+def _terminate_on_exit(owner, process):
+    """Terminate process on SIGTERM, SIGINT or once owner is finalized.
+
+    Previously installed signal handlers still run afterwards.
+    """
+    weakref.finalize(owner, process.terminate)
+
+    # Signal handlers can only be installed from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(signum)
+
+        def handler(signum, frame, previous=previous):
+            process.terminate()
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                # Default action; usually terminates this process
+                signal.signal(signum, signal.SIG_DFL)
+                os.kill(os.getpid(), signum)
+
+        signal.signal(signum, handler)
 
 
 def build_pipeline():
@@ -102,5 +224,39 @@ def build_pipeline():
 
     Unlike start_development_daemon, this function blocks until the process is
     complete.
+
+    The build is skipped if no inputs changed since the last successful build.
     """
-    subprocess.run(BUILD_PRODUCTION, cwd=settings.BASE_DIR)
+    fingerprint = _build_fingerprint()
+    fingerprint_file = (settings.BASE_DIR / 'autogenerated_static'
+                        / '.build_fingerprint')
+
+    try:
+        if fingerprint_file.read_text() == fingerprint:
+            logger.info('Frontend build is up to date')
+            return
+    except FileNotFoundError:
+        pass
+
+    result = subprocess.run(BUILD_PRODUCTION, cwd=settings.BASE_DIR,
+                            stdin=subprocess.DEVNULL)
+    if result.returncode == 0:
+        fingerprint_file.write_text(fingerprint)
+
+
+def _build_fingerprint():
+    """Compute a digest of paths, sizes and mtimes of production build inputs.
+    """
+    base = settings.BASE_DIR
+    paths = [base / name for name in _BUILD_CONFIGS]
+    paths += sorted(base.glob('*/webpack_src/**/*'))
+
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        digest.update(f"{path.relative_to(base)}\0{stat.st_size}\0"
+                      f"{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
@@ -4,14 +4,11 @@ from shutil import copyfile
 
 from django.conf import settings
 
-from . import autogenerators
 
-
-def _copy_license():
+def generate():
+    """Copy LICENSE into autogenerated_static."""
     copyfile(
         src=settings.BASE_DIR / 'LICENSE',
         dst=settings.BASE_DIR / 'autogenerated_static' / 'LICENSE.txt',
     )
 
-
-autogenerators.register(_copy_license)
@@ -2,68 +2,125 @@
 
 import io
 from os.path import exists, getmtime
+import sys
 
 from django.conf import settings
 
-import cairosvg
-from PIL import Image
-
-from . import autogenerators
+# cairosvg and PIL are imported when rendering; they are slow to load and most
+# processes never render the logo
 
 
+# Rendered sizes in ascending order; the last one is rasterized from SVG
 _SIZES = (16, 24, 32, 48, 256)
 
+# ICO size metadata, in the same order as _SIZES
+_ICO_SIZES = [(size, size) for size in _SIZES]
+
+
+def _render(ws):
+    """Render source SVG at the largest size.
+
+    Return a tuple of PNG bytes and a PIL Image. The render is made on first
+    request and kept in ws.
+    """
+    render = ws.get('render')
+    if render is None:
+        from cairosvg.parser import Tree
+        from cairosvg.surface import PNGSurface
+        from PIL import Image
+
+        size = max(_SIZES)
+        tree = Tree(url=str(ws['source']))
+        surface = PNGSurface(tree, None, 96,
+                             output_width=size, output_height=size).cairo
+
+        png = io.BytesIO()
+        surface.write_to_png(png)
+
+        if sys.byteorder == 'little':
+            # Take pixels directly instead of decoding the PNG. Cairo stores
+            # premultiplied ARGB in native-endian 32-bit words.
+            surface.flush()
+            image = Image.frombuffer(
+                'RGBA',
+                (surface.get_width(), surface.get_height()),
+                bytes(surface.get_data()),
+                'raw', 'BGRa', surface.get_stride(), 1,
+            )
+        else:
+            image = Image.open(io.BytesIO(png.getvalue()))
+
+        render = ws['render'] = (png.getvalue(), image)
+    return render
 
-def _generate_png(output, ws):
-    """Render source SVG into all _SIZES and output the hires PNG."""
 
-    # Render all sizes
-    def render(size):
-        return cairosvg.svg2png(
-            url=str(ws['source']),
-            output_width=size,
-            output_height=size,
-        )
-    renders = { size: render(size) for size in _SIZES }
+def _render_images(ws, sizes):
+    """Make PIL Images of source SVG in given sizes.
 
-    # Output highest resolution directly
-    output.write_bytes(renders[max(_SIZES)])
+    Smaller sizes are downscaled from the render of the largest size rather
+    than rasterized separately. Images are made on first request and kept in
+    ws.
+    """
+    from PIL import Image
 
-    # Share all renders as PIL Images
-    ws['renders'] = { size: Image.open(io.BytesIO(png))
-                      for size, png in renders.items() }
+    images = ws.setdefault('images', {})
+    if not images:
+        images[max(_SIZES)] = _render(ws)[1]
+
+    hires = images[max(_SIZES)]
+    for size in sizes:
+        if size not in images:
+            images[size] = hires.resize((size, size),
+                                        Image.Resampling.LANCZOS)
+
+    return [images[size] for size in sizes]
+
+
+def _generate_png(output, ws):
+    """Output the hires PNG."""
+    output.write_bytes(_render(ws)[0])
 
 
 def _generate_ico(output, ws):
     """Create an ICO with all renders."""
-    renders = [r for s, r in sorted(ws['renders'].items())]
+    renders = _render_images(ws, _SIZES)
     renders[-1].save(
         output,
         format='ico',
-        sizes=[(s, s) for s in ws['renders'].keys()],
+        sizes=_ICO_SIZES,
         append_images=renders[:-1],
     )
 
 
 def _generate_ico_16(output, ws):
     """Create an 16x-only ICO."""
-    ws['renders'][16].save(output, format='ico')
+    _render_images(ws, [16])[0].save(output, format='ico')
 
 
 def _generate_logo_files(source, output_dir):
-    """Transform source SVG into multiple useful files."""
+    """Transform source SVG into multiple useful files.
+
+    Files that are newer than source are left as is.
+    """
     outputs = [(output_dir / f, gen) for f, gen in [
         ('logo.png', _generate_png),
         ('logo.ico', _generate_ico),
         ('logo_16x.ico', _generate_ico_16),
     ]]
 
+    source_mtime = getmtime(source)
+    stale_outputs = [(output, gen) for output, gen in outputs
+                     if not exists(output) or getmtime(output) < source_mtime]
+
+    # Sizes are only rendered when a stale output needs them
     ws = {'source': source}
-    for output, subgenerator in outputs:
+    for output, subgenerator in stale_outputs:
         subgenerator(output, ws)
 
 
-autogenerators.register(lambda: _generate_logo_files(
-    source=settings.BASE_DIR / 'static' / 'logo.svg',
-    output_dir=settings.BASE_DIR / 'autogenerated_static',
-))
+def generate():
+    """Render static/logo.svg into autogenerated_static."""
+    _generate_logo_files(
+        source=settings.BASE_DIR / 'static' / 'logo.svg',
+        output_dir=settings.BASE_DIR / 'autogenerated_static',
+    )
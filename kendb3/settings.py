@@ -94,7 +94,7 @@ if ERROR_LOG:
 # (Here be dragons)
 # Application definition
 
-INSTALLED_APPS = [
+INSTALLED_APPS = (
     'api_lib.apps.ApiLibConfig',
     'viewmodule.apps.ViewmoduleConfig',
     'profiles.apps.ProfilesConfig',
@@ -108,24 +108,19 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-]
+)
 
-MIDDLEWARE = [
+MIDDLEWARE = (
     'django.middleware.security.SecurityMiddleware',
-    '(whitenoise here)',
+    # WhiteNoise serves static files in production only
+    *(() if DEBUG else ('whitenoise.middleware.WhiteNoiseMiddleware',)),
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-if DEBUG:
-    MIDDLEWARE.remove('(whitenoise here)');
-else:
-    MIDDLEWARE[MIDDLEWARE.index('(whitenoise here)')] = \
-        'whitenoise.middleware.WhiteNoiseMiddleware'
+)
 
 ROOT_URLCONF = 'kendb3.urls'
 
@@ -142,6 +137,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'util.context_processors.git',
             ],
         },
     },
@@ -1,12 +1,34 @@
 """Profile model."""
-import re
-
 from django.db import models
+from django.db.models.signals import post_save
 from django.contrib.auth.models import User
+from django.utils import timezone
 
+from api_lib import last_modified_manager
 from api_lib.api_fields import api_model, APIEngine
 
 
+_DISPLAY_NAME_CHARS = frozenset(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    '-.@+_()[]{}&=#~ '
+)
+"""Characters allowed in display names.
+
+Additionally, spaces are only allowed between other characters, one at a time.
+"""
+
+
+def _is_valid_display_name(value):
+    """Check value against the character rules for display names.
+
+    Additional length requirements exist that are not enforced here.
+    """
+    return (_DISPLAY_NAME_CHARS.issuperset(value)
+            and not value.startswith(' ')
+            and not value.endswith(' ')
+            and '  ' not in value)
+
+
 @api_model
 class Profile(models.Model):
     """Profile model.
@@ -22,18 +44,8 @@ class Profile(models.Model):
     @_api('basic', '*').property
     def display_name(self):
         """Preferred name for the user."""
-        return self.user.first_name or self.user.username
-
-    _display_name_pattern = re.compile(
-        r'^(?:{0}+ ?)*{0}$'.format(r'[A-Za-z0-9\-\.@+_\(\)\[\]\{\}&=#~]')
-    )
-    """Pattern that display names have to match.
-
-    Additional length requirements exist that are not enforced by this regex.
-
-    Explanation: allow several groups of allowed non-whitespace characters
-    separated by exactly one space.
-    """
+        user = self.user
+        return user.first_name or user.username
 
     @display_name.setter
     def display_name(self, value):
@@ -43,7 +55,7 @@ class Profile(models.Model):
             raise ValueError(f"Display name is too long ({len(value)} > 150)")
         elif len(value) < 3:
             raise ValueError(f"Display name is too short ({len(value)} < 3)")
-        elif Profile._display_name_pattern.fullmatch(value) is None:
+        elif not _is_valid_display_name(value):
             raise ValueError(f"Display name contains illegal characters")
         self.user.first_name = value
 
@@ -53,4 +65,23 @@ class Profile(models.Model):
     last_modified = models.DateTimeField(
         help_text=('Last modification timestamp.'),
         auto_now=True,
+        db_index=True,
     )
+
+
+# User fields that API fields of Profile read
+_USER_FIELDS = frozenset({'first_name', 'username'})
+
+
+def _touch_profile(instance, raw=False, update_fields=None, **kwargs):
+    """Update last_modified of the Profile of a saved User."""
+    if raw or (update_fields is not None
+               and _USER_FIELDS.isdisjoint(update_fields)):
+        return  # e.g. only last_login changed
+    if Profile.objects.filter(user=instance).update(
+            last_modified=timezone.now()):
+        # update() sends no signals
+        last_modified_manager.invalidate_cache()
+
+
+post_save.connect(_touch_profile, sender=User)
@@ -7,6 +7,8 @@ from api_lib import api_server
 
 @require_safe
 def profiles(request):
-    return api_server.success([
-        p.api_serialize() for p in Profile.objects.all()
-    ])
+    queryset = (Profile.objects
+                .select_related('user')
+                .only('user__first_name', 'user__username'))
+    return api_server.success_stream(Profile._api.serialize_queryset(
+        queryset, chunk_size=api_server.STREAM_CHUNK_SIZE))
@@ -8,7 +8,23 @@ from .models import (
 )
 
 
-admin.site.register(Submission)
-admin.site.register(SubmissionRevision)
+class SubmissionAdmin(admin.ModelAdmin):
+    # __str__ includes the name of the latest revision
+    list_select_related = ['cached_latest_revision']
+
+
+class SubmissionRevisionAdmin(admin.ModelAdmin):
+    # __str__ includes the submission and its latest revision
+    list_select_related = ['revision_of__cached_latest_revision']
+
+
+class AppearanceAdmin(admin.ModelAdmin):
+    # __str__ includes the revision, its submission and the latter's latest
+    # revision
+    list_select_related = ['revision__revision_of__cached_latest_revision']
+
+
+admin.site.register(Submission, SubmissionAdmin)
+admin.site.register(SubmissionRevision, SubmissionRevisionAdmin)
 admin.site.register(MinecraftVersion)
-admin.site.register(Appearance)
+admin.site.register(Appearance, AppearanceAdmin)
@@ -0,0 +1,14 @@
+"""Management command that recomputes cached latest revisions."""
+
+from django.core.management.base import BaseCommand
+
+from submissions.models import Submission
+
+
+class Command(BaseCommand):
+    help = ('Recompute the cached latest revision of every submission. Run '
+            'after migrating a database that predates the cache.')
+
+    def handle(self, *args, **options):
+        count = Submission.objects.update_latest_revisions()
+        self.stdout.write(f"Updated {count} submissions")
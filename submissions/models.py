@@ -1,15 +1,30 @@
 """Submissions, submission revisions and Minecraft versions."""
 
+from functools import lru_cache
+import re
+import time
+
 from django.db import models
-from django.core.validators import URLValidator
+from django.db.models.signals import post_delete, post_save
+from django.core.validators import RegexValidator
 
 from taggit.managers import TaggableManager
 
-from api_lib.api_fields import api_model, APIEngine
+from api_lib.api_fields import api_model, APIEngine, bulk_deserialized
+from api_lib.encoding import OrjsonEncoder
 
 
 URL_MAX_LENGTH = 256
-URL_VALIDATOR = URLValidator(schemes=['http', 'https'])
+
+# An http(s) URL without whitespace. Matching never backtracks excessively,
+# unlike Django's URLValidator, which also checks host names in detail.
+URL_VALIDATOR = RegexValidator(
+    re.compile(r'\Ahttps?://[^\s/$.?#][^\s]*\Z', re.IGNORECASE),
+    message='Enter a valid http or https URL.',
+)
+
+# Ordering of SubmissionRevisions that puts the latest revision first
+LATEST_REVISION_FIRST = ('-submitted_at', '-pk')
 
 
 @api_model
@@ -47,10 +62,19 @@ class MinecraftVersion(models.Model):
         default=False,
     )
 
+    last_modified = models.DateTimeField(
+        help_text=('Last modification timestamp.'),
+        auto_now=True,
+        db_index=True,
+    )
+
     def can_compare_to(self, other):
         """Check whether it makes sense to compare this object to `other`.
 
         If this check succeeds, __le__ and __eq__ will return valid results.
+        Otherwise, versions of different families are never equal and are
+        ordered by family, which is consistent but meaningless; check first
+        where that matters.
         """
 
         return isinstance(other, type(self)) and self.family == other.family
@@ -58,23 +82,69 @@ class MinecraftVersion(models.Model):
     def __le__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        if self.family != other.family:
-            raise ValueError('Attempted to compare versions of different '
-                             f"families: {self} and {other}.")
-        return self.comparator < other.comparator
+        return ((self.family, self.comparator)
+                <= (other.family, other.comparator))
 
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return NotImplemented
-        if self.family != other.family:
-            raise ValueError('Attempted to compare versions of different '
-                             f"families: {self} and {other}.")
-        return self.comparator == other.comparator
+        return ((self.family, self.comparator)
+                == (other.family, other.comparator))
 
     def __str__(self):
         return f"Minecraft version {self.display_name}"
 
 
+# Seconds for which all_minecraft_versions() trusts its cache. Changes made by
+# this process invalidate the cache immediately; other processes are only
+# noticed once it expires.
+MINECRAFT_VERSIONS_CACHE_TTL = 300
+
+# Incremented whenever a MinecraftVersion is saved or deleted
+_minecraft_versions_epoch = 0
+
+
+def _invalidate_minecraft_versions(**kwargs):
+    global _minecraft_versions_epoch
+    _minecraft_versions_epoch += 1
+
+
+post_save.connect(_invalidate_minecraft_versions, sender=MinecraftVersion)
+post_delete.connect(_invalidate_minecraft_versions, sender=MinecraftVersion)
+
+
+def all_minecraft_versions():
+    """Return a tuple of all MinecraftVersions.
+
+    The result is cached for up to MINECRAFT_VERSIONS_CACHE_TTL seconds, or
+    until a MinecraftVersion is saved or deleted. Returned instances are
+    shared; do not modify them.
+    """
+    period = int(time.monotonic() // MINECRAFT_VERSIONS_CACHE_TTL)
+    return _fetch_minecraft_versions(_minecraft_versions_epoch, period)
+
+
+@lru_cache(maxsize=1)
+def _fetch_minecraft_versions(epoch, period):
+    return tuple(MinecraftVersion.objects.all())
+
+
+class SubmissionQuerySet(models.QuerySet):
+    """QuerySet of Submissions."""
+
+    def update_latest_revisions(self):
+        """Recompute cached_latest_revision of submissions in this QuerySet.
+
+        This is done automatically when revisions are saved or deleted; call
+        this after modifications that send no signals, e.g. bulk operations.
+        """
+        latest = (SubmissionRevision.objects
+                  .filter(revision_of=models.OuterRef('pk'))
+                  .order_by(*LATEST_REVISION_FIRST)
+                  .values('pk')[:1])
+        return self.update(cached_latest_revision=models.Subquery(latest))
+
+
 @api_model
 class Submission(models.Model):
     """Submission model.
@@ -84,6 +154,8 @@ class Submission(models.Model):
 
     _api = APIEngine()
 
+    objects = SubmissionQuerySet.as_manager()
+
     submission_id = models.PositiveIntegerField(
         help_text=('Submission ID shown to visitors.'),
         primary_key=True,  # therefore, not using _api()
@@ -91,15 +163,25 @@ class Submission(models.Model):
 
     _api.add_related('revisions')
 
+    cached_latest_revision = models.ForeignKey(
+        help_text=('Latest revision of this submission. '
+                   'Maintained automatically.'),
+        to='SubmissionRevision',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        editable=False,
+    )
+
     def get_latest_revision(self, *, raise_if_none=True):
         """Fetch the latest revision of this submission.
 
         For submissions with no revisions, if raise_if_none is not False, raise
         a ValueError; return None otherwise.
+
+        The result is cached on this instance.
         """
-        rev_or_none = max(self.revisions.all(),
-                          key=lambda r: r.submitted_at,
-                          default=None)
+        rev_or_none = self.cached_latest_revision
         if rev_or_none is None and raise_if_none:
             raise ValueError('No revisions found for submission '
                              f"#{self.submission_id}")
@@ -108,12 +190,12 @@ class Submission(models.Model):
     @_api().property
     def latest_revision(self):
         """ID of the lastest revision of this submission or None."""
-        rev = self.get_latest_revision(raise_if_none=False)
-        return rev.id if rev else None
+        return self.cached_latest_revision_id
 
     last_modified = models.DateTimeField(
         help_text=('Last modification timestamp.'),
         auto_now=True,
+        db_index=True,
     )
 
     def __str__(self):
@@ -121,11 +203,10 @@ class Submission(models.Model):
         if latest:
             if latest.name:
                 max_length = 25
-                if len(latest.name) >= max_length:
-                    name = latest.name[:max_length] + '\u2026' # ellipsis
+                if len(latest.name) > max_length:
+                    name = f"'{latest.name[:max_length]}\u2026'"  # ellipsis
                 else:
-                    name = latest.name
-                name = repr(name)
+                    name = f"'{latest.name}'"
             else:
                 name = 'Untitled'
         else:
@@ -227,7 +308,7 @@ class SubmissionRevision(models.Model):
         blank=False,
     )
 
-    demo_url: _api() = models.URLField(
+    demo_url: _api() = models.CharField(
         help_text=('Video URL of a demo or trailer starting with '
                    '<code>http[s]://</code>. '
                    'Blank if none available.'),
@@ -250,6 +331,7 @@ class SubmissionRevision(models.Model):
         help_text=('Rules, permissions and other important remarks players '
                    'should read before playing. '
                    '[Format to be decided].'),  # TODO
+        encoder=OrjsonEncoder,
         blank=True,
     )
 
@@ -276,12 +358,38 @@ class SubmissionRevision(models.Model):
     last_modified = models.DateTimeField(
         help_text=('Last modification timestamp.'),
         auto_now=True,
+        db_index=True,
     )
 
+    class Meta:
+        indexes = [
+            # Latest revision of a submission
+            models.Index(fields=['revision_of', '-submitted_at'],
+                         name='subrev_latest_idx'),
+        ]
+
     def __str__(self):
         return f"{self.revision_of} v{self.revision_string}"
 
 
+def _update_latest_revision(instance, **kwargs):
+    Submission.objects.filter(pk=instance.revision_of_id) \
+        .update_latest_revisions()
+
+
+def _update_latest_revisions(objects, previous, **kwargs):
+    # Revisions may have moved away from their previous submissions
+    Submission.objects.filter(
+        pk__in={rev.revision_of_id for rev in (*objects, *previous)},
+    ).update_latest_revisions()
+
+
+post_save.connect(_update_latest_revision, sender=SubmissionRevision)
+post_delete.connect(_update_latest_revision, sender=SubmissionRevision)
+bulk_deserialized.connect(_update_latest_revisions,
+                          sender=SubmissionRevision)
+
+
 @api_model
 class Appearance(models.Model):
     """Mention of a submission in a video or similar."""
@@ -387,6 +495,7 @@ class Appearance(models.Model):
     last_modified = models.DateTimeField(
         help_text=('Last modification timestamp.'),
         auto_now=True,
+        db_index=True,
     )
 
     def __str__(self):
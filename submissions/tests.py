@@ -1,3 +1,127 @@
+import datetime
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from profiles.models import Profile
+from submissions.models import (
+    MinecraftVersion,
+    Submission,
+    SubmissionRevision,
+)
+
+
+class APIDeserializeManyTests(TestCase):
+    """Tests of api_deserialize_many() on SubmissionRevision."""
+
+    def setUp(self):
+        self.alice = Profile.objects.create(
+            user=User.objects.create(username='alice'))
+        self.bob = Profile.objects.create(
+            user=User.objects.create(username='bob'))
+        self.submission = Submission.objects.create(submission_id=1)
+        self.version = MinecraftVersion.objects.create(
+            comparator=0, family=1, display_name='1.20', is_common=True)
+
+    def revision_data(self, **kwargs):
+        data = {
+            'revision_of_id': self.submission.pk,
+            'name': 'Test map',
+            'revision_string': '1.0',
+            'authors_ids': [self.alice.pk],
+            'submitted_by_id': self.alice.pk,
+            'submitted_at': datetime.datetime(2024, 1, 1,
+                                              tzinfo=datetime.timezone.utc),
+            'download_url': 'https://example.com/map.zip',
+            'minecraft_version_min_id': self.version.pk,
+            'minecraft_version_max_id': self.version.pk,
+            'rules': {},
+            'tags': ['parkour'],
+        }
+        data.update(kwargs)
+        return data
+
+    def test_empty(self):
+        self.assertEqual(SubmissionRevision.api_deserialize_many([]), [])
+
+    def test_create(self):
+        objects = SubmissionRevision.api_deserialize_many([
+            self.revision_data(),
+            self.revision_data(id=100, revision_string='2.0'),
+        ])
+
+        self.assertEqual(len(objects), 2)
+        self.assertIsNotNone(objects[0].pk)
+        self.assertEqual(objects[1].pk, 100)
+        self.assertEqual(
+            sorted(SubmissionRevision.objects
+                   .values_list('revision_string', flat=True)),
+            ['1.0', '2.0'])
+
+    def test_update(self):
+        (created,) = SubmissionRevision.api_deserialize_many([
+            self.revision_data(id=100),
+        ])
+        last_modified = SubmissionRevision.objects.get(pk=100).last_modified
+
+        (updated,) = SubmissionRevision.api_deserialize_many([
+            self.revision_data(id=100, name='Renamed'),
+        ])
+
+        revision = SubmissionRevision.objects.get(pk=100)
+        self.assertEqual(updated.pk, 100)
+        self.assertEqual(revision.name, 'Renamed')
+        self.assertGreater(revision.last_modified, last_modified)
+        self.assertEqual(SubmissionRevision.objects.count(), 1)
+
+    def test_latest_revision(self):
+        SubmissionRevision.api_deserialize_many([self.revision_data(id=100)])
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.cached_latest_revision_id, 100)
+
+        later = datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc)
+        SubmissionRevision.api_deserialize_many([
+            self.revision_data(id=101, submitted_at=later),
+        ])
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.cached_latest_revision_id, 101)
+
+        other = Submission.objects.create(submission_id=2)
+        SubmissionRevision.api_deserialize_many([
+            {'id': 101, 'revision_of_id': other.pk},
+        ])
+        self.submission.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.submission.cached_latest_revision_id, 100)
+        self.assertEqual(other.cached_latest_revision_id, 101)
+
+    def test_update_keeps_absent_fields(self):
+        SubmissionRevision.api_deserialize_many([self.revision_data(id=100)])
+        added_at = SubmissionRevision.objects.get(pk=100).added_at
+
+        SubmissionRevision.api_deserialize_many([
+            {'id': 100, 'name': 'Renamed'},
+        ])
+
+        revision = SubmissionRevision.objects.get(pk=100)
+        self.assertEqual(revision.name, 'Renamed')
+        self.assertEqual(revision.revision_string, '1.0')
+        self.assertEqual(revision.added_at, added_at)
+        self.assertEqual(list(revision.authors.all()), [self.alice])
+
+    def test_related_setters(self):
+        (created,) = SubmissionRevision.api_deserialize_many([
+            self.revision_data(),
+        ])
+        revision = SubmissionRevision.objects.get(pk=created.pk)
+        self.assertEqual(list(revision.authors.all()), [self.alice])
+        self.assertEqual(list(revision.tags.names()), ['parkour'])
+
+        SubmissionRevision.api_deserialize_many([
+            self.revision_data(id=created.pk,
+                               authors_ids=[self.alice.pk, self.bob.pk],
+                               tags=['puzzle']),
+        ])
+        self.assertEqual(set(revision.authors.all()), {self.alice, self.bob})
+        self.assertEqual(list(revision.tags.names()), ['puzzle'])
+
@@ -1,30 +1,79 @@
+import hashlib
+import os
+
 from django.shortcuts import get_object_or_404, render
-from django.views.decorators.http import require_safe
+from django.views.decorators.http import condition, require_safe
 
 from api_lib.api_server import inject
+from api_lib.last_modified_manager import data_version_for_request
+
+from .models import (
+    Submission,
+    SubmissionRevision,
+    all_minecraft_versions,
+)
+
+
+def _page_etag(request, submission_id=None):
+    # Pages depend on templates and static files, which only change between
+    # deployed revisions, and on API data
+    git_sha = os.getenv('GIT_SHA')
+    if not git_sha:
+        return None
+
+    data_version = data_version_for_request(request)
+    # Minecraft versions are rendered from their own cache, which may lag
+    # behind the data version
+    versions = [(v.pk, v.family, v.comparator, v.display_name, v.is_common)
+                for v in all_minecraft_versions()]
+    key = f"{request.path}|{git_sha}|{data_version}|{versions!r}"
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+# Tuple (data version, injected packets) of the last submission list or None
+_list_cache = None
 
-from .models import Submission, SubmissionRevision, MinecraftVersion
+
+def _list_packets(request):
+    """Return injected packets with submissions and their latest revisions.
+
+    Packets are reused across requests until data changes. Do not modify them.
+    """
+    global _list_cache
+
+    key = data_version_for_request(request)
+    if _list_cache is None or _list_cache[0] != key:
+        subs = Submission.objects.all()
+        revs = SubmissionRevision.objects.filter(
+            pk__in=subs.values('cached_latest_revision'))
+
+        context = {}
+        inject(context, subs, dump=True, request=request)
+        inject(context, revs, 'basic', request=request)
+        _list_cache = (key, context.get('injected_packets', []))
+
+    return _list_cache[1]
 
 
 @require_safe
+@condition(etag_func=_page_etag)
 def page(request, submission_id=None):
 
-    context = inject({}, MinecraftVersion.objects.all(), dump=True)
+    context = {}
+    inject(context, all_minecraft_versions(), dump=True, request=request)
 
     if submission_id is None:
         # Inject list of submissions and basic info on latest revisions
-        subs = list(Submission.objects.all())
-        revs = (SubmissionRevision.objects
-            .filter(pk__in={sub.latest_revision for sub in subs}))
-
-        inject(context, subs, dump=True),
-        inject(context, revs, 'basic')
+        context['injected_packets'] = [
+            *context.get('injected_packets', []),
+            *_list_packets(request),
+        ]
     else:
         # Inject requested submission and its latest revision
         sub = get_object_or_404(Submission, pk=submission_id)
         rev = sub.get_latest_revision(raise_if_none=False)
 
-        inject(context, [sub])
-        inject(context, [rev], '*')
+        inject(context, [sub], request=request)
+        inject(context, [rev], '*', request=request)
 
     return render(request, "submissions/index.html", context=context)
@@ -0,0 +1,13 @@
+import os
+
+# Values shown in page footers. Environment does not change for the lifetime
+# of the process.
+_GIT = {
+    'git_ref': os.getenv('GIT_REF', '(dev)'),
+    'git_sha': os.getenv('GIT_SHA', '-')[:9],
+}
+
+
+def git(request):
+    """Add git_ref and git_sha of the deployed build to template context."""
+    return _GIT